@@ -1,335 +1,458 @@
-##################################################
-"""SLHAtools: Module for reading/writing SLHA files.
-
-Defines SLHAdata class for storing/manipulating SLHA data. 
-
-Copyright 2017-2020 Peter Cox
-"""
-
-__author__ = "Peter Cox"
-__email__ = "peter.cox@unimelb.edu.au"
-__version__ = 1.1
-
-##################################################
-
-import sys
-from collections import OrderedDict
-from contextlib import contextmanager
-
-##################################################
-
-# Commonly used particle IDs for accessing decay information
-_SM_pid = {'d':1, 'u':2, 's':3, 'c':4, 'b':5, 't':6,
- 		  'e':11, 've':12, 'mu':13, 'vm':14, 'tau':15, 'vt':16,
- 		  'g':21, 'a':22, 'Z':23, 'W':24}
-
-_Higgs_pid = {'h': 25, 'H0': 35, 'A0':36, 'H+':37}
-
-_MSSM_pid = {'~dL':1000001, '~uL':1000002, '~sL':1000003, '~cL':1000004, '~b1':1000005,'~t1':1000006,
-			'~eL':1000011, '~ve':1000012, '~muL':1000013, '~vmu':1000014, '~tau1':1000015, '~vt':1000016,
-			'~dR':2000001, '~uR':2000002, '~sR':2000003, '~cR':2000004, '~b2':2000005,'~t2':2000006,
-			'~eR':2000011, '~veR':2000012, '~muR':2000013, '~vmuR':2000014, '~tau2':2000015, '~vtR':2000016,
-			'~g':1000021, '~N1':1000022, '~N2':1000023, '~C1':1000024, '~N3':1000025, '~N4':1000035, '~C2':1000037, '~G':1000039}
-
-PIDs = {}
-PIDs.update(_SM_pid)
-PIDs.update(_Higgs_pid)
-PIDs.update(_MSSM_pid)
-
-##################################################
-
-class SLHAdata:
-	"""Class to store SLHA data and provide get/set functionality."""
-
-	def __init__(self):
-		self.preamble = ''
-		self._blocks = OrderedDict()
-		self._decays = OrderedDict()
-
-	def __str__(self):
-		return '<SLHAdata: {} blocks, {} decays>'.format(len(self._blocks), len(self._decays))
-
-	def Blocks(self):
-		"""Returns a list of block names."""
-		return list(self._blocks)
-
-	def Decays(self):
-		"""Returns a list of particle IDs that have decay information."""
-		return list(self._decays)
-
-	def FindBlock(self, blockname):
-		"""Finds first block that matches blockname."""
-		
-		for block in self._blocks.keys():
-			if block.startswith(blockname):
-				return block
-
-	def GetBlock(self, blockname):
-		"""Returns a block as an OrderedDict."""
-
-		try:
-			return self._blocks[blockname]['data']
-		except KeyError:
-			print("No block named '{}'!".format(blockname))
-			return None
-
-	def GetBlockString(self, blockname):
-		"""Returns a block as a string."""
-
-		try:
-			return _BlockToString(self._blocks[blockname])
-		except KeyError:
-			print("No block named '{}'!".format(blockname))
-			return ''
-
-	def GetValue(self, block, id):
-		"""Returns the value of an entry in a block."""
-
-		try:
-			return self._blocks[block]['data'][id]['value']
-		except KeyError:
-			print("No parameter '{}' in block '{}'!".format(id, block))
-			return None
-
-	def SetValue(self, block, id, value):
-		"""Sets the value of an entry in a block."""
-
-		try:
-			self._blocks[block]['data'][id]['value'] = value
-		except KeyError:
-			print("No parameter '{}' in block '{}'!".format(id, block))
-			return 1
-		return 0
-
-	def GetDecay(self, particle):
-		"""Returns decay information for particle as an OrderedDict."""
-
-		pid = GetPID(particle)
-		try:
-			return self._decays[pid]['data']
-		except KeyError:
-			print("No decays for particle '{}'.".format(pid))
-			return None
-
-	def GetDecayString(self, particle):
-		"""Returns decay information for particle as a string."""
-
-		pid = GetPID(particle)
-		try:
-			return _DecayToString(self._decays[pid])
-		except KeyError:
-			print("No decays for particle '{}'.".format(pid))
-			return ''
-
-	def GetWidth(self, particle):
-		"""Returns decay width of particle."""
-
-		pid = GetPID(particle)
-		try:
-			return self._decays[pid]['width']
-		except KeyError:
-			print("No decays for particle '{}'.".format(pid))
-			return None
-
-	def GetBR(self, particle, daughters):
-		"""Returns branching ratio for a given decay process."""
-
-		pid = GetPID(particle)
-		try:
-			return self._decays[pid]['data'][daughters]['BR']
-		except KeyError:
-			#print("Decay mode {} -> {} not found!".format(pid, daughters))
-			return 0.
-
-	def Write(self, SLHAfile=sys.stdout):
-		"""Write SLHA data.
-
-		SLHAfile can be a filename, sys.stdout (default), or sys.stderr.
-		"""
-		with _IOstream(SLHAfile) as fSLHA:
-
-			# Write preamble
-			fSLHA.write(self.preamble + '\n')
-		
-			# Write blocks
-			for block in self._blocks.values():
-				fSLHA.write(_BlockToString(block) + '\n')
-				fSLHA.write(block['comments'] + '\n')
-
-			# Write decays 
-			for decay in self._decays.values():
-				fSLHA.write(_DecayToString(decay) + '\n')
-				fSLHA.write(decay['comments'] + '\n')
-
-##################################################
-
-def GetPID(particle):
-	"""Get particle ID from name."""
-
-	if isinstance(particle, str):
-		try:
-			return PIDs[particle]
-		except KeyError:
-			print("Particle '{}' is unknown.".format(particle))
-			return None
-	else:
-		return particle
-
-##################################################
-
-def ReadSLHA(SLHAfile):
-	"""Read an SLHA file and return SLHAdata instance."""
-
-	with open(SLHAfile) as fSLHA:
-
-		SLHA_data = SLHAdata()	
-		data_type = None
-
-		for line in fSLHA.readlines():
-			line = line.strip()
-
-			# Get comments
-			if line.startswith('#'):
-				if data_type == None:
-					SLHA_data.preamble += (line + '\n')
-				elif data_type == 'B':
-					SLHA_data._blocks[block]['comments'] += (line + '\n')
-				elif data_type == 'D':
-					SLHA_data._decays[pid]['comments'] += (line + '\n')
-				continue
-
-			# Separate data and description
-			data = line.split('#',1)[0]
-			try:
-				description = line.split('#',1)[1]
-			except IndexError:
-				description = ''
-
-			# New block
-			if line.lower().startswith('block'):
-				data_type = 'B'
-				block = data.split(None,1)[1].strip()
-				try:
-					SLHA_data._blocks[block]
-					print("WARNING: multiple '{}' blocks. Only first will be kept!".format(block))
-				except KeyError:
-					SLHA_data._blocks[block] = {'name': block, 'description': description, 'comments': '', 'data': OrderedDict()}
-
-			# New decay
-			elif line.lower().startswith('decay'):
-				data_type = 'D'
-				data = data.split()
-				pid = int(data[1])
-				width = float(data[2])
-				try:
-					SLHA_data._decays[pid]
-					print("WARNING: multiple decay tables for {}. Only first will be kept!".format(pid))
-				except KeyError:
-					SLHA_data._decays[pid] = {'pid': pid, 'width': width, 'description': description, 'comments': '', 'data': OrderedDict()}
-
-			# Read block
-			# For entries with more than 2 columns, key is a tuple of all columns except last
-			# For more than three columns, tuple is kept as string
-			elif data_type == 'B':
-				data = data.split()
-				columns = len(data)
-				if columns == 0:
-					continue
-				if columns <= 2:
-					try:
-						keys = int(data[0])
-					except ValueError:
-						keys = data[0]
-				elif columns == 3:
-					try:
-						keys = tuple([int(x) for x in data[:-1]])
-					except ValueError:
-						keys = tuple(data[:-1])
-				else:
-					keys = tuple(data[:-1])
-
-				value = data[-1]
-
-				try:
-					SLHA_data._blocks[block]['data'][keys]
-					print("WARNING: repeat entries in block {}. Only first will be kept!".format(block))
-				except KeyError:
-					SLHA_data._blocks[block]['data'][keys] = {'key': keys, 'value': value, 'description': description, 'columns': columns}
-
-			# Read decay
-			elif data_type == 'D':
-				data = data.split()
-				if len(data) < 4:
-					continue
-
-				BR = float(data[0])
-				Nbody = int(data[1])
-				daughters = [int(d) for d in data[2:]]
-
-				try:
-					SLHA_data._decays[pid]['data'][tuple(daughters)]
-					print("WARNING: repeat entries in decay table for {}. Only first will be kept!".format(pid))
-				except KeyError:
-					SLHA_data._decays[pid]['data'][tuple(daughters)] = {'N-body': Nbody, 'daughters': tuple(daughters), 'BR': BR, 'description': description}
-
-	return SLHA_data
-
-##################################################
-
-def _BlockToString(block):
-	"""Convert block to string for printing/writing."""
-
-	blockstring = 'BLOCK ' + block['name']
-	if block['description'] != '':
-		blockstring += '    # ' + block['description']
-
-	for param in block['data'].values():
-		blockstring += '\n  '
-
-		if isinstance(param['key'], int) or isinstance(param['key'], str):
-			blockstring += '{:<3}  '.format(param['key'])
-		else:
-			for k in param['key']:
-				blockstring += '{:<2}  '.format(k)
-
-		if param['columns'] > 1: 
-			blockstring += '{:<16}'.format(param['value'])
-		if param['description'] != '':
-			blockstring += '    # ' + param['description']
-
-	return blockstring
-
-##################################################
-
-def _DecayToString(decay):
-	"""Convert decay to string for printing/writing."""
-
-	decaystring = 'DECAY   {:<8}   {:<16}'.format(decay['pid'], decay['width'])
-	if decay['description'] != '':
-		decaystring += '    # ' + decay['description']
-
-	for dmode in decay['data'].values():
-		decaystring += '\n  {:<16}'.format(dmode['BR'])
-
-		for d in dmode['daughters']:
-			decaystring += '  {:>8}'.format(d)
-
-		if dmode['description'] != '':
-			decaystring += '    # ' + dmode['description']
-
-	return decaystring
-
-##################################################
-
-@contextmanager
-def _IOstream(file):
-	if file == sys.stdout:
-		yield sys.stdout
-	elif file == sys.stderr:
-		yield sys.stderr
-	else:
-		f = open(file, 'w')
-		yield f
-		f.close()
-
+##################################################
+"""SLHAtools: Module for reading/writing SLHA files.
+
+Defines SLHAdata class for storing/manipulating SLHA data. 
+
+Copyright 2017-2020 Peter Cox
+"""
+
+__author__ = "Peter Cox"
+__email__ = "peter.cox@unimelb.edu.au"
+__version__ = 1.1
+
+##################################################
+
+import re
+import sys
+from contextlib import contextmanager
+from types import MappingProxyType
+
+# NumPy is optional; it enables the vectorized decay-table views
+try:
+	import numpy as np
+except ImportError:
+	np = None
+
+##################################################
+
+# Commonly used particle IDs for accessing decay information
+_SM_pid = {'d':1, 'u':2, 's':3, 'c':4, 'b':5, 't':6,
+ 		  'e':11, 've':12, 'mu':13, 'vm':14, 'tau':15, 'vt':16,
+ 		  'g':21, 'a':22, 'Z':23, 'W':24}
+
+_Higgs_pid = {'h': 25, 'H0': 35, 'A0':36, 'H+':37}
+
+_MSSM_pid = {'~dL':1000001, '~uL':1000002, '~sL':1000003, '~cL':1000004, '~b1':1000005,'~t1':1000006,
+			'~eL':1000011, '~ve':1000012, '~muL':1000013, '~vmu':1000014, '~tau1':1000015, '~vt':1000016,
+			'~dR':2000001, '~uR':2000002, '~sR':2000003, '~cR':2000004, '~b2':2000005,'~t2':2000006,
+			'~eR':2000011, '~veR':2000012, '~muR':2000013, '~vmuR':2000014, '~tau2':2000015, '~vtR':2000016,
+			'~g':1000021, '~N1':1000022, '~N2':1000023, '~C1':1000024, '~N3':1000025, '~N4':1000035, '~C2':1000037, '~G':1000039}
+
+# Single merged lookup table, frozen so callers cannot mutate it
+PIDs = MappingProxyType({**_SM_pid, **_Higgs_pid, **_MSSM_pid})
+
+##################################################
+
+class SLHAdata:
+	"""Class to store SLHA data and provide get/set functionality."""
+
+	def __init__(self):
+		self.preamble = ''
+		self._blocks = {}
+		self._decays = {}
+
+	def __str__(self):
+		return '<SLHAdata: {} blocks, {} decays>'.format(len(self._blocks), len(self._decays))
+
+	def Blocks(self):
+		"""Returns a list of block names."""
+		return list(self._blocks)
+
+	def Decays(self):
+		"""Returns a list of particle IDs that have decay information."""
+		return list(self._decays)
+
+	def FindBlock(self, blockname):
+		"""Finds first block that matches blockname."""
+		
+		for block in self._blocks.keys():
+			if block.startswith(blockname):
+				return block
+
+	def GetBlock(self, blockname):
+		"""Returns a block as a dict mapping keys to values."""
+
+		try:
+			blk = self._blocks[blockname]
+		except KeyError:
+			print("No block named '{}'!".format(blockname))
+			return None
+		return dict(zip(blk['keys'], blk['values']))
+
+	def GetBlockString(self, blockname):
+		"""Returns a block as a string."""
+
+		try:
+			return _BlockToString(self._blocks[blockname])
+		except KeyError:
+			print("No block named '{}'!".format(blockname))
+			return ''
+
+	def GetValue(self, block, id):
+		"""Returns the value of an entry in a block."""
+
+		try:
+			blk = self._blocks[block]
+			return blk['values'][blk['data'][id]]
+		except KeyError:
+			print("No parameter '{}' in block '{}'!".format(id, block))
+			return None
+
+	def SetValue(self, block, id, value):
+		"""Sets the value of an entry in a block."""
+
+		try:
+			blk = self._blocks[block]
+			blk['values'][blk['data'][id]] = value
+		except KeyError:
+			print("No parameter '{}' in block '{}'!".format(id, block))
+			return 1
+		# Invalidate the cached serialized form of the modified block
+		self._blocks[block].pop('_str_cache', None)
+		return 0
+
+	def GetDecay(self, particle):
+		"""Returns decay information for particle as a dict."""
+
+		pid = GetPID(particle)
+		try:
+			return self._decays[pid]['data']
+		except KeyError:
+			print("No decays for particle '{}'.".format(pid))
+			return None
+
+	def GetDecayString(self, particle):
+		"""Returns decay information for particle as a string."""
+
+		pid = GetPID(particle)
+		try:
+			return _DecayToString(self._decays[pid])
+		except KeyError:
+			print("No decays for particle '{}'.".format(pid))
+			return ''
+
+	def GetWidth(self, particle):
+		"""Returns decay width of particle."""
+
+		pid = GetPID(particle)
+		try:
+			return self._decays[pid]['width']
+		except KeyError:
+			print("No decays for particle '{}'.".format(pid))
+			return None
+
+	def GetBR(self, particle, daughters):
+		"""Returns branching ratio for a given decay process."""
+
+		pid = GetPID(particle)
+		try:
+			return self._decays[pid]['data'][daughters]['BR']
+		except KeyError:
+			#print("Decay mode {} -> {} not found!".format(pid, daughters))
+			return 0.
+
+	def GetBRs(self, particle, daughter_list):
+		"""Returns branching ratios for a list of decay processes.
+
+		Resolves the particle once and reuses the decay table for all
+		queries; prefer this over repeated GetBR calls in scan loops.
+		Unknown decay modes give a branching ratio of 0.
+		"""
+
+		pid = GetPID(particle)
+		try:
+			d = self._decays[pid]['data']
+		except KeyError:
+			return [0.] * len(daughter_list)
+		return [d[t]['BR'] if t in d else 0. for t in daughter_list]
+
+	def GetBRset(self, particle, daughters):
+		"""Returns branching ratio for a given decay process, ignoring daughter ordering."""
+
+		pid = GetPID(particle)
+		try:
+			return self._decays[pid]['_by_set'].get(tuple(sorted(daughters)), 0.)
+		except KeyError:
+			return 0.
+
+	def SumBR(self, particle, mask=None):
+		"""Returns the sum of branching ratios for particle.
+
+		mask can be a boolean array over the decay channels (in table
+		order) to restrict the sum. Requires NumPy.
+		"""
+
+		if np is None:
+			print("NumPy is required for SumBR.")
+			return None
+		pid = GetPID(particle)
+		try:
+			br = self._decays[pid]['br_np']
+		except KeyError:
+			print("No decays for particle '{}'.".format(pid))
+			return None
+		if mask is None:
+			return br.sum()
+		return br[mask].sum()
+
+	def Write(self, SLHAfile=sys.stdout):
+		"""Write SLHA data.
+
+		SLHAfile can be a filename, sys.stdout (default), or sys.stderr.
+		"""
+		# Collect all pieces and emit them with a single write call,
+		# instead of one syscall per block/decay/comment string
+		out = [self.preamble]
+
+		# Write blocks
+		for block in self._blocks.values():
+			out.append(_BlockToString(block))
+			out.append(block['comments'])
+
+		# Write decays 
+		for decay in self._decays.values():
+			out.append(_DecayToString(decay))
+			out.append(decay['comments'])
+
+		with _IOstream(SLHAfile) as fSLHA:
+			fSLHA.write('\n'.join(out) + '\n')
+
+##################################################
+
+# Bound method hoisted at import; GetPID is hot in GetBR/GetWidth scan loops
+_PIDs_get = PIDs.get
+
+def GetPID(particle):
+	"""Get particle ID from name."""
+
+	if type(particle) is str:
+		pid = _PIDs_get(particle)
+		if pid is None:
+			print("Particle '{}' is unknown.".format(particle))
+		return pid
+	else:
+		return particle
+
+##################################################
+
+# Matches a signed integer token; used to classify block keys without
+# raising ValueError from int() on string-keyed blocks
+_INT_MATCH = re.compile(r'[-+]?\d+\Z').match
+
+def ReadSLHA(SLHAfile):
+	"""Read an SLHA file and return SLHAdata instance."""
+
+	SLHA_data = SLHAdata()
+	SLHA_data.preamble, SLHA_data._blocks, SLHA_data._decays = _ParseSLHA(SLHAfile)
+
+	# Join accumulated comment lines into strings
+	SLHA_data.preamble = '\n'.join(SLHA_data.preamble) + '\n' if SLHA_data.preamble else ''
+	for block in SLHA_data._blocks.values():
+		block['comments'] = '\n'.join(block['comments']) + '\n' if block['comments'] else ''
+	for decay in SLHA_data._decays.values():
+		decay['comments'] = '\n'.join(decay['comments']) + '\n' if decay['comments'] else ''
+
+	# Parallel NumPy views of each decay table (channels in table order),
+	# enabling vectorized reductions over branching ratios and daughters.
+	# Daughter rows are padded with 0 (not a valid particle ID).
+	if np is not None:
+		for decay in SLHA_data._decays.values():
+			channels = decay['data'].values()
+			n = len(channels)
+			decay['br_np'] = np.fromiter((c['BR'] for c in channels), dtype=np.float64, count=n)
+			if n > 0:
+				Nmax = max(len(c['daughters']) for c in channels)
+				decay['daughters_np'] = np.array([c['daughters'] + (0,)*(Nmax-len(c['daughters'])) for c in channels], dtype=np.int32)
+			else:
+				decay['daughters_np'] = np.empty((0, 0), dtype=np.int32)
+
+	return SLHA_data
+
+##################################################
+
+def _ParseSLHA(SLHAfile):
+	"""Parse an SLHA file into (preamble, blocks, decays) structures."""
+
+	preamble = []
+	blocks = {}
+	decays = {}
+	data_type = None
+
+	# The file is read in one call and split into lines at C level
+	with open(SLHAfile) as fSLHA:
+		buf = fSLHA.read()
+
+	for line in buf.splitlines():
+		line = line.strip()
+		if not line:
+			continue
+
+		# Get comments
+		if line[0] == '#':
+			if data_type == None:
+				preamble.append(line)
+			elif data_type == 'B':
+				cur_block_comments.append(line)
+			elif data_type == 'D':
+				cur_decay_comments.append(line)
+			continue
+
+		# Separate data and description
+		data, _, description = line.partition('#')
+
+		# Only lower-case the keyword on candidate header lines
+		head = ''
+		if line[0] in 'BbDd':
+			head = line[:5].lower()
+
+		# New block
+		if head == 'block':
+			data_type = 'B'
+			block = data.split(None, 1)[1].strip()
+			if block in blocks:
+				print("WARNING: multiple '{}' blocks. Only first will be kept!".format(block))
+			else:
+				# Entries are stored in a struct-of-arrays layout: 'data' maps
+				# each key to an index into the parallel per-column lists
+				blocks[block] = {'name': block, 'description': description, 'comments': [], 'data': {},
+								'keys': [], 'values': [], 'descriptions': [], 'columns': []}
+			# Hoist dict lookups out of the per-line loop
+			cur_block = blocks[block]
+			cur_block_data = cur_block['data']
+			cur_block_comments = cur_block['comments']
+
+		# New decay
+		elif head == 'decay':
+			data_type = 'D'
+			data = data.split()
+			pid = int(data[1])
+			width = float(data[2])
+			if pid in decays:
+				print("WARNING: multiple decay tables for {}. Only first will be kept!".format(pid))
+			else:
+				# '_by_set' indexes branching ratios by the sorted daughter
+				# tuple for order-independent lookups
+				decays[pid] = {'pid': pid, 'width': width, 'description': description, 'comments': [], 'data': {}, '_by_set': {}}
+			cur_decay_data = decays[pid]['data']
+			cur_decay_comments = decays[pid]['comments']
+			cur_decay_by_set = decays[pid]['_by_set']
+
+		# Read block
+		# For entries with more than 2 columns, key is a tuple of all columns except last
+		# For more than three columns, tuple is kept as string
+		elif data_type == 'B':
+			data = data.split()
+			columns = len(data)
+			if columns == 0:
+				continue
+			if columns <= 2:
+				s = data[0]
+				keys = int(s) if _INT_MATCH(s) else s
+			elif columns == 3:
+				if _INT_MATCH(data[0]) and _INT_MATCH(data[1]):
+					keys = (int(data[0]), int(data[1]))
+				else:
+					keys = (data[0], data[1])
+			else:
+				keys = tuple(data[:-1])
+
+			value = data[-1]
+
+			if keys in cur_block_data:
+				print("WARNING: repeat entries in block {}. Only first will be kept!".format(block))
+			else:
+				cur_block_data[keys] = len(cur_block['keys'])
+				cur_block['keys'].append(keys)
+				cur_block['values'].append(value)
+				cur_block['descriptions'].append(description)
+				cur_block['columns'].append(columns)
+
+		# Read decay
+		elif data_type == 'D':
+			data = data.split()
+			if len(data) < 4:
+				continue
+
+			BR = float(data[0])
+			Nbody = int(data[1])
+			daughters = tuple(map(int, data[2:]))
+
+			if daughters in cur_decay_data:
+				print("WARNING: repeat entries in decay table for {}. Only first will be kept!".format(pid))
+			else:
+				cur_decay_data[daughters] = {'N-body': Nbody, 'daughters': daughters, 'BR': BR, 'description': description}
+				cur_decay_by_set.setdefault(tuple(sorted(daughters)), BR)
+
+	return preamble, blocks, decays
+
+##################################################
+
+def _BlockToString(block):
+	"""Convert block to string for printing/writing."""
+
+	# Serialized form is cached on the block; SetValue invalidates it
+	cached = block.get('_str_cache')
+	if cached is not None:
+		return cached
+
+	# Build a list of fragments and join once; repeated += on a growing
+	# string is quadratic in block size
+	parts = ['BLOCK ', block['name']]
+	if block['description'] != '':
+		parts.append('    # ' + block['description'])
+
+	for key, value, description, columns in zip(block['keys'], block['values'], block['descriptions'], block['columns']):
+		parts.append('\n  ')
+
+		if isinstance(key, int) or isinstance(key, str):
+			parts.append('{:<3}  '.format(key))
+		else:
+			for k in key:
+				parts.append('{:<2}  '.format(k))
+
+		if columns > 1: 
+			parts.append('{:<16}'.format(value))
+		if description != '':
+			parts.append('    # ' + description)
+
+	block['_str_cache'] = ''.join(parts)
+	return block['_str_cache']
+
+##################################################
+
+def _DecayToString(decay):
+	"""Convert decay to string for printing/writing."""
+
+	# Not cached: GetDecay hands out the live channel dicts, so callers
+	# can modify decay data without going through an invalidating setter.
+	parts = ['DECAY   {:<8}   {:<16}'.format(decay['pid'], decay['width'])]
+	if decay['description'] != '':
+		parts.append('    # ' + decay['description'])
+
+	for dmode in decay['data'].values():
+		parts.append('\n  {:<16}'.format(dmode['BR']))
+
+		# One %-interpolation per channel instead of a format call per daughter
+		parts.append(('  %8d' * len(dmode['daughters'])) % dmode['daughters'])
+
+		if dmode['description'] != '':
+			parts.append('    # ' + dmode['description'])
+
+	return ''.join(parts)
+
+##################################################
+
+@contextmanager
+def _IOstream(file):
+	if file == sys.stdout:
+		yield sys.stdout
+	elif file == sys.stderr:
+		yield sys.stderr
+	else:
+		f = open(file, 'w', buffering=1<<20)
+		try:
+			yield f
+		finally:
+			f.close()
+
 ##################################################
\ No newline at end of file